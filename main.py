@@ -2,7 +2,6 @@ import asyncio
 import tkinter as tk
 from websocket_client import WebSocketClient
 from ui import TradeSimulatorUI
-import threading
 import logging
 import sys
 import signal
@@ -29,8 +28,12 @@ class Application:
         # Create UI
         self.ui = TradeSimulatorUI(self.root)
         
-        # Setup asyncio event loop
+        # Setup asyncio event loop, pumped from the Tk main loop
         self.loop = asyncio.new_event_loop()
+        self.pump_interval_ms = 5
+        self.pump_budget_s = 0.002  # time slice given to asyncio per pump
+        self._pump_id = None
+        self.ws_task = None
         
         # Create WebSocket client
         self.ws_client = WebSocketClient(ui_callback=self.ui.update_display)
@@ -42,30 +45,23 @@ class Application:
         logger.info("Application initialized")
 
     def start_websocket(self):
-        """Start WebSocket client in a separate thread"""
-        def run_loop(loop):
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_forever()
-            except Exception as e:
-                logger.error(f"Event loop error: {str(e)}")
-            finally:
-                logger.info("Event loop stopped")
+        """Start WebSocket client on the asyncio loop, driven from the Tk main loop"""
+        asyncio.set_event_loop(self.loop)
+        self.ws_task = self.loop.create_task(self.ws_client.run())
+        self._pump_id = self.root.after(self.pump_interval_ms, self._pump_asyncio)
+        logger.info("WebSocket client scheduled")
 
-        # Start WebSocket in separate thread
-        self.ws_thread = threading.Thread(
-            target=run_loop,
-            args=(self.loop,),
-            daemon=True
-        )
-        self.ws_thread.start()
-        logger.info("WebSocket thread started")
-
-        # Schedule WebSocket connection
-        asyncio.run_coroutine_threadsafe(
-            self.ws_client.run(),
-            self.loop
-        )
+    def _pump_asyncio(self):
+        """Run the asyncio loop for a short time slice, then hand control back to Tk"""
+        try:
+            # A single iteration per pump is not enough: each message needs several
+            # loop hops (socket read, future wakeup, wait_for task), so run every
+            # ready callback and any I/O arriving within the budget
+            self.loop.call_later(self.pump_budget_s, self.loop.stop)
+            self.loop.run_forever()
+        except Exception as e:
+            logger.error(f"Event loop error: {str(e)}")
+        self._pump_id = self.root.after(self.pump_interval_ms, self._pump_asyncio)
 
     def run(self):
         """Run the application"""
@@ -97,9 +93,23 @@ class Application:
         logger.info("Cleaning up resources")
         # Stop WebSocket client
         self.ws_client.running = False
-        # Stop event loop
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
+        # Stop pumping the event loop
+        if self._pump_id is not None:
+            self.root.after_cancel(self._pump_id)
+            self._pump_id = None
+        if self.ws_task is not None and not self.ws_task.done():
+            self.ws_task.cancel()
+        # Let the cancelled client unwind, then close the loop
+        if not self.loop.is_closed() and not self.loop.is_running():
+            if self.ws_task is not None:
+                # Bounded so a slow close handshake cannot hold up window close
+                try:
+                    self.loop.run_until_complete(
+                        asyncio.wait_for(asyncio.gather(self.ws_task, return_exceptions=True), timeout=1)
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("WebSocket client did not stop within 1s")
+            self.loop.close()
         logger.info("Cleanup complete")
 
 
@@ -1,6 +1,8 @@
 import numpy as np
-from statsmodels.regression.quantile_regression import QuantReg
+from numba import njit
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass
 from functools import lru_cache
 
 # Configure logging
@@ -11,52 +13,121 @@ logging.basicConfig(
 logger = logging.getLogger("Models")
 
 
+@njit(cache=True)
+def _weighted_median(prices, volumes, target_size):
+    """Volume-weighted median price: walk the book from the best level and
+    return the price where cumulative volume crosses target_size."""
+    order = np.argsort(-prices)
+    cum_volume = 0.0
+    prev_price = prices[order[0]]
+    for i in range(order.shape[0]):
+        price = prices[order[i]]
+        volume = volumes[order[i]]
+        if cum_volume + volume >= target_size:
+            if volume <= 0.0:
+                return price
+            # Linear interpolation for the fractional crossing
+            frac = (target_size - cum_volume) / volume
+            return prev_price + frac * (price - prev_price)
+        cum_volume += volume
+        prev_price = price
+    return prev_price
+
+
+@lru_cache(maxsize=32)
+def _impact_calc(usd_quantity, ask_ticks, bid_ticks, tick_size, coef):
+    """Cached Almgren-Chriss impact, keyed on prices in ticks and plain model parameters."""
+    best_ask = ask_ticks * tick_size
+    best_bid = bid_ticks * tick_size
+    spread = best_ask - best_bid
+    # Order size from the snapped ask, so sub-tick moves do not change the key
+    order_size = usd_quantity / best_ask
+
+    # Temporary impact (instantaneous)
+    temp_impact = coef * (order_size ** 1.5) * spread / best_ask
+    # Permanent impact (simplified)
+    perm_impact = 0.3 * temp_impact
+    return temp_impact + perm_impact
+
+
+@dataclass
+class ParsedBook:
+    """Orderbook levels parsed once per tick and shared by all models."""
+    bids: np.ndarray
+    asks: np.ndarray
+    best_bid: float
+    best_ask: float
+    mid: float
+
+    @staticmethod
+    def _parse_levels(levels):
+        """(n, 2) price/size array; extra per-level fields (e.g. OKX order counts) are dropped."""
+        if not levels:
+            return np.empty((0, 2))
+        return np.asarray(levels, dtype=np.float64)[:, :2]
+
+    @classmethod
+    def from_orderbook(cls, order_book):
+        """Build from raw [price, size, ...] levels as delivered by the feed."""
+        bids = cls._parse_levels(order_book.get('bids'))
+        asks = cls._parse_levels(order_book.get('asks'))
+        best_bid = float(bids[0, 0]) if len(bids) else 0.0
+        best_ask = float(asks[0, 0]) if len(asks) else 0.0
+        mid = (best_bid + best_ask) / 2 if len(bids) and len(asks) else 0.0
+        return cls(bids, asks, best_bid, best_ask, mid)
+
+
 class SlippageModel:
-    def __init__(self, volatility=0.02, order_size=100):
+    def __init__(self, volatility=0.02, order_size=100, tick_size=0.01, lot_size=0.01, cache_size=32):
         self.volatility = volatility
         self.order_size = order_size
+        self.tick_size = tick_size
+        self.lot_size = lot_size
+        self.cache_size = cache_size
         self.last_slippage = 0.0
+        self._slippage_cache = OrderedDict()
+        # Compile the numba kernel now rather than on the first tick, which runs on the UI thread.
+        # Column views of an (n, 2) array match the argument types of real calls.
+        warmup = np.ones((1, 2))
+        _weighted_median(warmup[:, 0], warmup[:, 1], 1.0)
         logger.info(f"SlippageModel initialized with volatility={volatility}, order_size={order_size}")
 
-    @lru_cache(maxsize=32)
-    def _cached_slippage_calculation(self, bid_tuple):
-        """Cached version of slippage calculation for similar orderbooks."""
+    def _slippage_calculation(self, bids):
+        """Slippage calculation for a single orderbook snapshot."""
         try:
-            bids = np.array(bid_tuple)
             if len(bids) == 0:
                 return 0.0
 
-            X = bids[:, 1].reshape(-1, 1)  # Volume as feature
-            y = bids[:, 0]  # Price levels
-            
-            # Use robust model fitting with error handling
+            # Median (q=0.5) execution price for the order size, weighted by volume
             try:
-                model = QuantReg(y, X).fit(q=0.5)
-                predicted_price = model.predict([self.order_size])[0]
+                predicted_price = _weighted_median(bids[:, 0], bids[:, 1], float(self.order_size))
                 best_bid = bids[0, 0]
                 return abs(predicted_price - best_bid) / best_bid
             except Exception as e:
-                logger.warning(f"Quantile regression failed: {str(e)}. Using fallback calculation.")
+                logger.warning(f"Weighted median failed: {str(e)}. Using fallback calculation.")
                 # Fallback to simpler calculation if regression fails
                 return self.volatility * (self.order_size / bids[:, 1].sum()) * 0.1
         except Exception as e:
-            logger.error(f"Error in cached slippage calculation: {str(e)}")
+            logger.error(f"Error in slippage calculation: {str(e)}")
             return self.last_slippage or 0.0
 
-    def calculate_expected_slippage(self, order_book):
-        """Quantile regression-based slippage estimation."""
+    def calculate_expected_slippage(self, book):
+        """Weighted-median (q=0.5) slippage estimation."""
         try:
-            if not order_book or 'bids' not in order_book or not order_book['bids']:
+            if book is None or len(book.bids) == 0:
                 return self.last_slippage or 0.0
                 
-            # Convert to numpy arrays
-            bids_array = np.array([(float(p), float(v)) for p, v in order_book['bids']])
-            
-            # Convert to hashable format for caching
-            bid_tuple = tuple(map(tuple, bids_array))
-            
-            # Use cached calculation
-            slippage = self._cached_slippage_calculation(bid_tuple)
+            # Fingerprint on best bid and total volume snapped to tick/lot size,
+            # so books that only differ below that precision share an entry
+            key = (round(book.best_bid / self.tick_size), round(book.bids[:, 1].sum() / self.lot_size))
+            slippage = self._slippage_cache.get(key)
+            if slippage is None:
+                slippage = self._slippage_calculation(book.bids)
+                self._slippage_cache[key] = slippage
+                if len(self._slippage_cache) > self.cache_size:
+                    self._slippage_cache.popitem(last=False)
+            else:
+                self._slippage_cache.move_to_end(key)
             self.last_slippage = slippage
             return slippage
         except Exception as e:
@@ -78,37 +149,22 @@ class FeeModel:
 
 
 class MarketImpactModel:
-    def __init__(self, impact_coefficient=0.1):
+    def __init__(self, impact_coefficient=0.1, tick_size=0.01):
         self.impact_coefficient = impact_coefficient
+        self.tick_size = tick_size
         self.last_impact = 0.0
         logger.info(f"MarketImpactModel initialized with impact_coefficient={impact_coefficient}")
 
-    @lru_cache(maxsize=32)
-    def _cached_impact_calculation(self, order_size, best_ask, best_bid):
-        """Cached version of market impact calculation."""
-        try:
-            spread = best_ask - best_bid
-            
-            # Temporary impact (instantaneous)
-            temp_impact = self.impact_coefficient * (order_size ** 1.5) * spread / best_ask
-            # Permanent impact (simplified)
-            perm_impact = 0.3 * temp_impact
-            return temp_impact + perm_impact
-        except Exception as e:
-            logger.error(f"Error in cached impact calculation: {str(e)}")
-            return self.last_impact or 0.0
-
-    def calculate_market_impact(self, order_size, order_book):
+    def calculate_market_impact(self, usd_quantity, book):
         """Enhanced Almgren-Chriss with permanent/temporary impact."""
         try:
-            if not order_book or 'asks' not in order_book or not order_book['asks'] or 'bids' not in order_book or not order_book['bids']:
+            if book is None or len(book.asks) == 0 or len(book.bids) == 0:
                 return self.last_impact or 0.0
                 
-            best_ask = float(order_book['asks'][0][0])
-            best_bid = float(order_book['bids'][0][0])
-            
-            # Use cached calculation
-            impact = self._cached_impact_calculation(order_size, best_ask, best_bid)
+            # Snap prices to integer ticks so repeated levels hit the cache
+            ask_ticks = round(book.best_ask / self.tick_size)
+            bid_ticks = round(book.best_bid / self.tick_size)
+            impact = _impact_calc(usd_quantity, ask_ticks, bid_ticks, self.tick_size, self.impact_coefficient)
             self.last_impact = impact
             return impact
         except Exception as e:
@@ -124,19 +180,19 @@ class TradeCostCalculator:
         self.last_cost = {'slippage': 0, 'fees': 0, 'impact': 0, 'net_cost': 0}
         logger.info("TradeCostCalculator initialized")
 
-    def calculate_total_cost(self, usd_quantity, order_book):
+    def calculate_total_cost(self, usd_quantity, book):
         try:
-            if not order_book or 'asks' not in order_book or not order_book['asks']:
+            if book is None or len(book.asks) == 0:
                 logger.warning("Invalid order book data for cost calculation")
                 return self.last_cost
                 
-            best_ask = float(order_book['asks'][0][0])
+            best_ask = book.best_ask
             order_size = usd_quantity / best_ask
             
             # Calculate components
-            slippage = self.slippage_model.calculate_expected_slippage(order_book)
+            slippage = self.slippage_model.calculate_expected_slippage(book)
             fees = self.fee_model.calculate_expected_fees(order_size, best_ask)
-            impact = self.impact_model.calculate_market_impact(order_size, order_book)
+            impact = self.impact_model.calculate_market_impact(usd_quantity, book)
             
             # Calculate net cost
             result = {
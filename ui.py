@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 import logging
+from datetime import datetime
 
 # Configure logging
 logging.basicConfig(
@@ -11,6 +12,20 @@ logger = logging.getLogger("UI")
 
 
 class TradeSimulatorUI:
+    # Display formats for the raw values produced by the WebSocket client
+    VALUE_FORMATS = {
+        'volatility': "{:.2%}",
+        'slippage': "{:.6f}",
+        'fees': "${:.4f}",
+        'impact': "{:.6f}",
+        'net_cost': "${:.4f}",
+        'maker_proportion': "{:.1f}%",
+        'taker_proportion': "{:.1f}%",
+        'processing_latency': "{:.2f}ms",
+        'total_latency': "{:.2f}ms",
+        'avg_latency': "{:.2f}ms"
+    }
+
     def __init__(self, root):
         self.root = root
         self.root.title("Trade Simulator")
@@ -37,6 +52,16 @@ class TradeSimulatorUI:
         # Setup status bar
         self.setup_status_bar()
         
+        # Last text shown per metric, so unchanged values skip StringVar.set
+        self._metric_vars = {**self.output_vars, **self.perf_vars}
+        self._last = {key: None for key in self._metric_vars}
+        
+        # Latest orderbook result, repainted at a fixed rate
+        self.refresh_interval_ms = 100
+        self._pending = None
+        self._painted = None
+        self.root.after(self.refresh_interval_ms, self._flush)
+        
         logger.info("UI initialized")
 
     def setup_styles(self):
@@ -151,25 +176,30 @@ class TradeSimulatorUI:
 
     def setup_orderbook_display(self):
         """Setup orderbook display"""
-        # Create headers
-        header_frame = ttk.Frame(self.orderbook_frame)
-        header_frame.pack(fill=tk.X)
-        
-        ttk.Label(header_frame, text="Price", width=12).pack(side=tk.LEFT, padx=5)
-        ttk.Label(header_frame, text="Volume", width=12).pack(side=tk.LEFT, padx=5)
-        ttk.Label(header_frame, text="", width=5).pack(side=tk.LEFT)
-        ttk.Label(header_frame, text="Price", width=12).pack(side=tk.LEFT, padx=5)
-        ttk.Label(header_frame, text="Volume", width=12).pack(side=tk.LEFT, padx=5)
+        self.orderbook_depth = 5
+        book_frame = ttk.Frame(self.orderbook_frame)
+        book_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        # Orderbook text display
-        self.orderbook_text = tk.Text(self.orderbook_frame, height=15, width=60, font=('Courier', 10))
-        self.orderbook_text.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.orderbook_text.config(state='disabled')
+        # One fixed-size table per side; rows are created once and updated in place
+        self.bid_tree, self.bid_iids = self._create_book_side(book_frame, "bid", "green")
+        self.ask_tree, self.ask_iids = self._create_book_side(book_frame, "ask", "red")
         
         # Add timestamp display
         self.timestamp_var = tk.StringVar(value="Last update: -")
         ttk.Label(self.orderbook_frame, textvariable=self.timestamp_var, style='Status.TLabel').pack(anchor=tk.E)
 
+    def _create_book_side(self, parent, side, color):
+        """Create a pre-populated price/volume table for one side of the book"""
+        tree = ttk.Treeview(parent, columns=('price', 'volume'), show='headings', height=self.orderbook_depth)
+        tree.heading('price', text="Price")
+        tree.heading('volume', text="Volume")
+        tree.column('price', width=120, anchor=tk.E)
+        tree.column('volume', width=120, anchor=tk.E)
+        tree.tag_configure(side, foreground=color)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        iids = [tree.insert('', tk.END, values=("", ""), tags=(side,)) for _ in range(self.orderbook_depth)]
+        return tree, iids
+
     def setup_status_bar(self):
         """Setup status bar at bottom of window"""
         self.status_var = tk.StringVar(value="Ready")
@@ -178,21 +208,32 @@ class TradeSimulatorUI:
 
     def update_display(self, data):
         """Schedule UI update on main thread"""
-        self.root.after(0, lambda: self._update_display(data))
+        if isinstance(data, dict) and 'bids' in data:
+            # Orderbook ticks only replace the latest snapshot; _flush repaints it
+            self._pending = data
+        else:
+            # Status and error messages are rare, show them immediately
+            self.root.after(0, lambda: self._update_display(data))
+
+    def _flush(self):
+        """Repaint the latest orderbook snapshot, if a new one arrived"""
+        data = self._pending
+        if data is not self._painted:
+            self._painted = data
+            self._update_display(data)
+        self.root.after(self.refresh_interval_ms, self._flush)
 
     def _update_display(self, data):
         """Update UI with new data"""
         try:
             if isinstance(data, dict):
-                # Update output metrics
-                for key, var in self.output_vars.items():
-                    if key in data:
-                        var.set(data[key])
-                
-                # Update performance metrics
-                for key, var in self.perf_vars.items():
+                # Update output and performance metrics that changed
+                for key, var in self._metric_vars.items():
                     if key in data:
-                        var.set(data[key])
+                        text = self._format_value(key, data[key])
+                        if text != self._last[key]:
+                            var.set(text)
+                            self._last[key] = text
                 
                 # Update orderbook
                 if 'bids' in data and 'asks' in data:
@@ -200,7 +241,8 @@ class TradeSimulatorUI:
                     
                 # Update timestamp
                 if 'timestamp' in data:
-                    self.timestamp_var.set(f"Last update: {data['timestamp']}")
+                    timestamp = datetime.fromtimestamp(data['timestamp']).strftime("%H:%M:%S.%f")[:-3]
+                    self.timestamp_var.set(f"Last update: {timestamp}")
                     
                 # Update status
                 if 'status' in data:
@@ -214,45 +256,24 @@ class TradeSimulatorUI:
             self.status_var.set(f"UI Error: {str(e)}")
             self.status_label.configure(style='Error.TLabel')
 
+    def _format_value(self, key, value):
+        """Format a raw metric value for display"""
+        fmt = self.VALUE_FORMATS.get(key)
+        return fmt.format(value) if fmt else value
+
     def _update_orderbook(self, data):
         """Update orderbook display"""
         try:
-            self.orderbook_text.config(state='normal')
-            self.orderbook_text.delete(1.0, tk.END)
-            
-            # Format and display bids and asks
-            bids = sorted([(float(p), float(v)) for p, v in data['bids'][:5]], reverse=True)
-            asks = sorted([(float(p), float(v)) for p, v in data['asks'][:5]])
-            
-            # Create a formatted display with colors
-            text = ""
-            for i in range(max(len(bids), len(asks))):
-                if i < len(bids):
-                    bid_price, bid_vol = bids[i]
-                    text += f"{bid_price:>10.2f} {bid_vol:>10.4f}  |  "
-                else:
-                    text += " " * 23 + "|  "
-                    
-                if i < len(asks):
-                    ask_price, ask_vol = asks[i]
-                    text += f"{ask_price:<10.2f} {ask_vol:<10.4f}\n"
-                else:
-                    text += "\n"
-            
-            self.orderbook_text.insert(tk.END, text)
-            
-            # Apply colors (green for bids, red for asks)
-            lines = text.split('\n')
-            for i, line in enumerate(lines):
-                if '|' in line:
-                    bid_end = line.find('|')
-                    if bid_end > 0:
-                        self.orderbook_text.tag_add("bid", f"{i+1}.0", f"{i+1}.{bid_end}")
-                    if bid_end < len(line):
-                        self.orderbook_text.tag_add("ask", f"{i+1}.{bid_end+1}", f"{i+1}.end")
+            # Levels arrive parsed and already sorted by the feed (bids descending, asks ascending)
+            bids = data['bids'][:self.orderbook_depth]
+            asks = data['asks'][:self.orderbook_depth]
             
-            self.orderbook_text.tag_config("bid", foreground="green")
-            self.orderbook_text.tag_config("ask", foreground="red")
-            self.orderbook_text.config(state='disabled')
+            for tree, iids, levels in ((self.bid_tree, self.bid_iids, bids), (self.ask_tree, self.ask_iids, asks)):
+                for i, iid in enumerate(iids):
+                    if i < len(levels):
+                        price, vol = levels[i]
+                        tree.item(iid, values=(f"{price:.2f}", f"{vol:.4f}"))
+                    else:
+                        tree.item(iid, values=("", ""))
         except Exception as e:
-            logger.error(f"Orderbook update error: {e}")
\ No newline at end of file
+            logger.error(f"Orderbook update error: {e}")
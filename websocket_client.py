@@ -3,11 +3,16 @@ import websockets
 import json
 import logging
 import numpy as np
-from datetime import datetime
-from sklearn.linear_model import LogisticRegression
-from models import TradeCostCalculator, SlippageModel, FeeModel, MarketImpactModel
 import time
-from functools import lru_cache
+from collections import deque
+from models import TradeCostCalculator, SlippageModel, FeeModel, MarketImpactModel, ParsedBook
+
+# orjson parses numbers in C and is several times faster than the stdlib parser
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +25,11 @@ logger = logging.getLogger("WebSocketClient")
 WS_URL = "Do not have the right to display it publicly"
 
 
+def _sigmoid(x):
+    """Numerically stable logistic function."""
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
 class WebSocketClient:
     def __init__(self, ui_callback):
         self.ui_callback = ui_callback
@@ -27,11 +37,11 @@ class WebSocketClient:
         self.retry_count = 0
         self.max_retries = 5
         self.retry_delay = 5
-        self.latencies = []
+        self.latencies = deque(maxlen=1024)  # recent processing latencies (ms)
         self.message_count = 0
-        self.last_model_update = 0
-        self.model_update_interval = 5  # seconds
-        self.logistic_model = None
+        self.maker_taker_alpha = 1.0  # sigmoid steepness for maker/taker
+        self._last_fp = None  # top 5 levels of the last processed snapshot
+        self._last_result = None
 
         # Initialize models
         self.slippage_model = SlippageModel(volatility=0.02, order_size=100)
@@ -43,68 +53,44 @@ class WebSocketClient:
 
         # Performance metrics
         self.avg_processing_time = 0
-        self.max_processing_time = 0
-        self.min_processing_time = float('inf')
+        self.latency_smoothing = 0.05  # EWMA weight of the newest sample
         
         logger.info("WebSocket client initialized")
 
-    @lru_cache(maxsize=32)
-    def _cached_maker_taker_calculation(self, bid_tuple, ask_tuple):
-        """Cached version of maker/taker calculation for similar orderbooks."""
-        # Convert tuples back to arrays for processing
-        bids = np.array(bid_tuple)
-        asks = np.array(ask_tuple)
-        
-        if len(bids) == 0 or len(asks) == 0:
-            return "0%", "0%"
-            
+    def _calculate_maker_taker(self, book):
+        """Sigmoid-based estimate of the maker/taker proportion."""
+        if len(book.bids) == 0 or len(book.asks) == 0:
+            return 0.0, 0.0
+
         try:
-            mid_price = (bids[0, 0] + asks[0, 0]) / 2
-
-            # Features: [price_distance_from_mid, log_volume]
-            X = np.vstack([
-                np.column_stack([bids[:, 0] - mid_price, np.log(np.maximum(bids[:, 1], 0.001))]),
-                np.column_stack([asks[:, 0] - mid_price, np.log(np.maximum(asks[:, 1], 0.001))])
-            ])
-            # Labels: 1=maker (near mid), 0=taker (aggressive)
-            y = np.concatenate([
-                np.ones(len(bids)),  # Bids are makers
-                np.zeros(len(asks))  # Asks are takers (for market buys)
-            ])
-
-            # Only retrain model periodically to save CPU
-            current_time = time.time()
-            if self.logistic_model is None or (current_time - self.last_model_update > self.model_update_interval):
-                self.logistic_model = LogisticRegression(warm_start=True)
-                self.logistic_model.fit(X, y)
-                self.last_model_update = current_time
-                
-            maker_prop = self.logistic_model.predict_proba(X)[:, 1].mean() * 100
-            return f"{maker_prop:.1f}%", f"{100 - maker_prop:.1f}%"
+            bids, asks = book.bids, book.asks
+            mid_price = book.mid
+
+            # Features: [price_distance_from_mid, log_volume], bids then asks in one
+            # float32 buffer. Distances are taken in float64 first: absolute prices
+            # around 1e5 would lose the 0.01 tick in float32.
+            n_bids = len(bids)
+            X = np.empty((n_bids + len(asks), 2), dtype=np.float32)
+            X[:n_bids, 0] = bids[:, 0] - mid_price
+            X[n_bids:, 0] = asks[:, 0] - mid_price
+            X[:n_bids, 1] = bids[:, 1]
+            X[n_bids:, 1] = asks[:, 1]
+            # One clamp and one log over both sides' volumes, in place
+            log_volume = X[:, 1]
+            np.log(np.maximum(log_volume, 0.001, out=log_volume), out=log_volume)
+
+            # Closed-form sigmoid of distance-from-mid weighted by log-volume
+            maker_prop = float(_sigmoid(-self.maker_taker_alpha * X[:, 0] * X[:, 1]).mean()) * 100
+            return maker_prop, 100 - maker_prop
         except Exception as e:
             logger.error(f"Error in maker/taker calculation: {str(e)}")
-            return "0%", "0%"
+            return 0.0, 0.0
 
-    def _calculate_maker_taker(self, bids, asks):
-        """Logistic regression classifier for maker/taker."""
-        if not bids or not asks:
-            return "0%", "0%"
-
-        try:
-            # Convert to numpy arrays for processing
-            bids_array = np.array([(float(p), float(v)) for p, v in bids])
-            asks_array = np.array([(float(p), float(v)) for p, v in asks])
-            
-            # Convert to hashable format for caching
-            bid_tuple = tuple(map(tuple, bids_array))
-            ask_tuple = tuple(map(tuple, asks_array))
-            
-            # Use cached calculation if available
-            return self._cached_maker_taker_calculation(bid_tuple, ask_tuple)
-            
-        except Exception as e:
-            logger.error(f"Error preparing data for maker/taker calculation: {str(e)}")
-            return "0%", "0%"
+    def latency_percentiles(self):
+        """P50/P95/P99 of the recent processing latencies in ms."""
+        if not self.latencies:
+            return 0.0, 0.0, 0.0
+        return tuple(np.percentile(self.latencies, [50, 95, 99]))
 
     async def run(self):
         self.running = True
@@ -118,33 +104,37 @@ class WebSocketClient:
 
                     while self.running:
                         try:
-                            start_time = datetime.now()
+                            start_ns = time.perf_counter_ns()
                             message = await asyncio.wait_for(websocket.recv(), timeout=10)
-                            processing_start = datetime.now()
+                            processing_start_ns = time.perf_counter_ns()
 
-                            data = json.loads(message)
+                            data = _json_loads(message)
                             result = self.process_orderbook(data)
                             self.message_count += 1
 
                             # Latency tracking
-                            processing_ms = (datetime.now() - processing_start).total_seconds() * 1000
-                            total_ms = (datetime.now() - start_time).total_seconds() * 1000
+                            end_ns = time.perf_counter_ns()
+                            processing_ms = (end_ns - processing_start_ns) / 1e6
+                            total_ms = (end_ns - start_ns) / 1e6
                             
                             # Update performance metrics
-                            self.avg_processing_time = (self.avg_processing_time * (self.message_count - 1) + processing_ms) / self.message_count
-                            self.max_processing_time = max(self.max_processing_time, processing_ms)
-                            self.min_processing_time = min(self.min_processing_time, processing_ms)
+                            if self.message_count == 1:
+                                self.avg_processing_time = processing_ms
+                            else:
+                                self.avg_processing_time += self.latency_smoothing * (processing_ms - self.avg_processing_time)
+                            self.latencies.append(processing_ms)
                             
                             result.update({
-                                "processing_latency": f"{processing_ms:.2f}ms",
-                                "total_latency": f"{total_ms:.2f}ms",
-                                "avg_latency": f"{self.avg_processing_time:.2f}ms"
+                                "processing_latency": processing_ms,
+                                "total_latency": total_ms,
+                                "avg_latency": self.avg_processing_time
                             })
                             self.ui_callback(result)
                             
                             # Log performance every 100 messages
                             if self.message_count % 100 == 0:
-                                logger.info(f"Performance: Avg={self.avg_processing_time:.2f}ms, Min={self.min_processing_time:.2f}ms, Max={self.max_processing_time:.2f}ms")
+                                p50, p95, p99 = self.latency_percentiles()
+                                logger.info(f"Performance: Avg={self.avg_processing_time:.2f}ms, P50={p50:.2f}ms, P95={p95:.2f}ms, P99={p99:.2f}ms")
                                 
                         except asyncio.TimeoutError:
                             logger.warning("WebSocket timeout, reconnecting...")
@@ -170,21 +160,33 @@ class WebSocketClient:
                 logger.warning("Received invalid orderbook data")
                 return {'error': 'Invalid orderbook data'}
                 
-            cost_data = self.cost_calculator.calculate_total_cost(100, data)
-            maker_prop, taker_prop = self._calculate_maker_taker(data.get('bids', []), data.get('asks', []))
-
-            return {
-                'timestamp': datetime.now().strftime("%H:%M:%S.%f")[:-3],
-                'slippage': f"{cost_data['slippage']:.6f}",
-                'fees': f"${cost_data['fees']:.4f}",
-                'impact': f"{cost_data['impact']:.6f}",
-                'net_cost': f"${cost_data['slippage'] + cost_data['fees'] + cost_data['impact']:.4f}",
+            # Resent snapshots with an unchanged top 5 levels reuse the last result
+            fp = (tuple(map(tuple, data['bids'][:5])), tuple(map(tuple, data['asks'][:5])))
+            if fp == self._last_fp:
+                return dict(self._last_result, timestamp=time.time())
+                
+            # Parse the levels once and share them with every model
+            book = ParsedBook.from_orderbook(data)
+            cost_data = self.cost_calculator.calculate_total_cost(100, book)
+            maker_prop, taker_prop = self._calculate_maker_taker(book)
+
+            # Raw values only; the UI formats them when it repaints
+            result = {
+                'timestamp': time.time(),
+                'slippage': cost_data['slippage'],
+                'fees': cost_data['fees'],
+                'impact': cost_data['impact'],
+                'net_cost': cost_data['net_cost'],
                 'maker_proportion': maker_prop,
                 'taker_proportion': taker_prop,
-                'bids': data['bids'][:5],
-                'asks': data['asks'][:5],
-                'volatility': f"{self.slippage_model.volatility * 100:.2f}%"
+                'bids': book.bids[:5],
+                'asks': book.asks[:5],
+                'volatility': self.slippage_model.volatility
             }
+            self._last_fp = fp
+            self._last_result = result
+            # Callers add latency fields to the returned dict, keep the cached one clean
+            return dict(result)
         except Exception as e:
             logger.error(f"Processing error: {e}")
             return {'error': str(e)}
\ No newline at end of file